@@ -1,473 +1,659 @@
-import random
-from typing import List, Dict
-from dataclasses import dataclass
-from datetime import datetime
-from enum import Enum
-
-
-class FitnessLevel(str, Enum):
-    BEGINNER = "Beginner"
-    INTERMEDIATE = "Intermediate"
-    ADVANCED = "Advanced"
-
-
-class HealthCondition(str, Enum):
-    KNEE_PAIN = "Knee Pain"
-    BACK_PAIN = "Back Pain"
-    HEART_CONDITION = "Heart Condition"
-    SHOULDER_INJURY = "Shoulder Injury"
-
-
-@dataclass
-class UserProfile:
-    age: int
-    height: float
-    weight: float
-    gender: str
-    fitness_level: FitnessLevel
-    health_conditions: List[HealthCondition]
-    goal: str
-    preferred_days: int
-
-
-class ExerciseDatabase:
-    def __init__(self):
-        self.workout_types = {
-            'Cardio': [
-                'Treadmill', 'Cycling', 'Swimming', 'Rowing', 'Elliptical',
-                'Jump Rope', 'Running', 'Stair Climbing', 'Boxing', 'Kickboxing',
-                'Dancing', 'Mountain Climbers', 'Burpees', 'High Knees'
-            ],
-            'Strength': [
-                'Squats', 'Deadlifts', 'Bench Press', 'Shoulder Press',
-                'Pull-ups', 'Push-ups', 'Lunges', 'Dumbbell Rows',
-                'Leg Press', 'Tricep Dips', 'Bicep Curls', 'Plank Holds',
-                'Romanian Deadlifts', 'Hip Thrusts', 'Face Pulls'
-            ],
-            'Flexibility': [
-                'Yoga', 'Pilates', 'Dynamic Stretching', 'Static Stretching',
-                'Foam Rolling', 'Mobility Work', 'Cat-Cow Stretch',
-                'Downward Dog', "Child's Pose", 'Hamstring Stretch',
-                'Hip Flexor Stretch', 'Shoulder Rolls', 'Spine Twists'
-            ],
-            'HIIT': [
-                'Burpee Intervals', 'Sprint Intervals', 'Jump Rope Intervals',
-                'Mountain Climber Intervals', 'Squat Jumps', 'Box Jumps',
-                'Battle Ropes', 'Kettlebell Swings', 'Medicine Ball Slams'
-            ]
-        }
-
-        self.health_restrictions = {
-            HealthCondition.KNEE_PAIN: [
-                'Squats', 'Lunges', 'Box Jumps', 'Jump Rope',
-                'Stair Climbing', 'Burpees', 'Mountain Climbers'
-            ],
-            HealthCondition.BACK_PAIN: [
-                'Deadlifts', 'Romanian Deadlifts', 'Shoulder Press',
-                'Bench Press', 'Good Mornings'
-            ],
-            HealthCondition.HEART_CONDITION: [
-                'HIIT', 'Sprint Intervals', 'Burpee Intervals',
-                'Box Jumps', 'Battle Ropes'
-            ],
-            HealthCondition.SHOULDER_INJURY: [
-                'Pull-ups', 'Shoulder Press', 'Bench Press',
-                'Face Pulls', 'Push-ups'
-            ]
-        }
-
-        self.equipment_mapping = {
-            'Treadmill': ['Treadmill'],
-            'Cycling': ['Stationary Bike'],
-            'Yoga': ['Yoga Mat'],
-            'Kettlebell Swings': ['Kettlebell'],
-            'Box Jumps': ['Plyo Box'],
-            'Deadlifts': ['Barbell', 'Weight Plates'],
-            'Squats': ['Barbell', 'Weight Plates'],
-            'Swimming': ['Pool Access'],
-            'Rowing': ['Rowing Machine']
-        }
-
-
-class WorkoutPlanner:
-    def __init__(self):
-        self.exercise_db = ExerciseDatabase()
-        self.goal_workout_mapping = {
-            'Weight Loss': {
-                'primary_type': 'Cardio',
-                'workout_split': {
-                    'Cardio': 0.50,
-                    'Strength': 0.30,
-                    'HIIT': 0.20
-                },
-                'intensity_range': {
-                    'Cardio': '65-75% max heart rate',
-                    'Strength': '12-15 reps',
-                    'HIIT': '30 seconds work/30 seconds rest'
-                }
-            },
-            'Muscle Gain': {
-                'primary_type': 'Strength',
-                'workout_split': {
-                    'Strength': 0.70,
-                    'Cardio': 0.15,
-                    'Flexibility': 0.15
-                },
-                'intensity_range': {
-                    'Strength': '8-12 reps',
-                    'Cardio': '20-30 minutes low intensity',
-                    'Flexibility': '15-20 minutes'
-                }
-            },
-            'Endurance': {
-                'primary_type': 'Cardio',
-                'workout_split': {
-                    'Cardio': 0.60,
-                    'Strength': 0.25,
-                    'Flexibility': 0.15
-                },
-                'intensity_range': {
-                    'Cardio': '60-70% max heart rate',
-                    'Strength': '15-20 reps',
-                    'Flexibility': '20-30 minutes'
-                }
-            },
-            'Flexibility': {
-                'primary_type': 'Flexibility',
-                'workout_split': {
-                    'Flexibility': 0.60,
-                    'Strength': 0.25,
-                    'Cardio': 0.15
-                },
-                'intensity_range': {
-                    'Flexibility': '30-45 minutes',
-                    'Strength': '12-15 reps',
-                    'Cardio': '20-30 minutes low intensity'
-                }
-            }
-        }
-
-    def calculate_difficulty_modifier(self, user: UserProfile) -> float:
-        """Calculate workout difficulty based on user profile"""
-        base_modifier = {
-            FitnessLevel.BEGINNER: 0.8,
-            FitnessLevel.INTERMEDIATE: 1.1,
-            FitnessLevel.ADVANCED: 1.4
-        }.get(user.fitness_level, 1.0)
-
-        # Adjust for health conditions
-        if user.health_conditions:
-            base_modifier *= 0.9
-
-        return base_modifier
-
-    def generate_workout_plan(self, user: UserProfile, weeks: int = 4) -> Dict:
-        """Generate a complete workout plan based on user profile"""
-        difficulty_modifier = self.calculate_difficulty_modifier(user)
-        goal_data = self.goal_workout_mapping[user.goal]
-
-        workout_plan = {
-            'user_profile': user,
-            'start_date': datetime.now(),
-            'weeks': {}
-        }
-
-        for week in range(1, weeks + 1):
-            weekly_plan = []
-            week_progression = self.calculate_progression(week, difficulty_modifier)
-
-            for day in range(user.preferred_days):
-                workout_type = self.select_workout_type(goal_data['workout_split'])
-                daily_workout = self.generate_daily_workout(
-                    workout_type=workout_type,
-                    intensity=goal_data['intensity_range'][workout_type],
-                    user=user,
-                    progression=week_progression
-                )
-                weekly_plan.append(daily_workout)
-
-            workout_plan['weeks'][f'Week {week}'] = {
-                'progression_level': week_progression,
-                'workouts': weekly_plan
-            }
-
-        return workout_plan
-
-    def calculate_progression(self, week: int, difficulty_modifier: float) -> Dict:
-        """Calculate progressive overload for the week"""
-        base_progression = {
-            'volume_multiplier': 1 + (0.1 * (week - 1)),
-            'intensity_multiplier': 1 + (0.05 * (week - 1)),
-            'complexity_level': min(3, 1 + int((week - 1) / 2))
-        }
-        # Apply difficulty modifier
-        base_progression['volume_multiplier'] *= difficulty_modifier
-        base_progression['intensity_multiplier'] *= difficulty_modifier
-
-        return base_progression
-
-    def select_workout_type(self, workout_split: Dict[str, float]) -> str:
-        """Select workout type based on split probabilities"""
-        rand = random.random()
-        cumulative = 0
-        for workout_type, probability in workout_split.items():
-            cumulative += probability
-            if rand <= cumulative:
-                return workout_type
-        return list(workout_split.keys())[0]  # Fallback
-
-    def generate_daily_workout(self, workout_type: str, intensity: str,
-                                user: UserProfile, progression: Dict) -> Dict:
-        """Generate a single day's workout"""
-        exercises_pool = self.exercise_db.workout_types[workout_type].copy()
-
-        # Apply health condition filters
-        for condition in user.health_conditions:
-            restricted = self.exercise_db.health_restrictions.get(condition, [])
-            exercises_pool = [e for e in exercises_pool if e not in restricted]
-
-        # Fallback if all exercises are filtered out
-        if not exercises_pool:
-            exercises_pool = ["Low-Impact Walking" if workout_type == "Cardio"
-                              else "Bodyweight Isometric Holds"]
-
-        num_exercises = self.calculate_num_exercises(user.fitness_level, progression)
-
-        selected_exercises = random.sample(
-            exercises_pool,
-            min(num_exercises, len(exercises_pool))
-        )
-
-        # Calculate total duration
-        total_duration = self.calculate_duration(workout_type, user.fitness_level)
-        total_duration_min = int(total_duration.split()[0])  # Extract minutes as int
-        
-        formatted_exercises = []
-        for i, exercise in enumerate(selected_exercises):
-            formatted_exercises.append(
-                self.format_exercise(
-                    exercise, 
-                    workout_type, 
-                    progression,
-                    i,  # Pass the exercise index
-                    len(selected_exercises),
-                    total_duration_min
-                )
-            )
-
-        return {
-            'type': workout_type,
-            'intensity': intensity,
-            'exercises': formatted_exercises,
-            'duration': total_duration,
-            'required_equipment': self.get_required_equipment(selected_exercises)
-        }
-
-    def calculate_num_exercises(self, fitness_level: FitnessLevel, progression: Dict) -> int:
-        """Calculate number of exercises based on fitness level and progression"""
-        base_exercises = {
-            FitnessLevel.BEGINNER: 4,
-            FitnessLevel.INTERMEDIATE: 5,
-            FitnessLevel.ADVANCED: 6
-        }.get(fitness_level, 3)
-
-        return int(base_exercises * progression['volume_multiplier'])
-
-    def format_exercise(self, exercise: str, workout_type: str, progression: Dict,
-                        exercise_index: int, num_exercises: int, total_duration_min: int) -> Dict:
-        """Format exercise with sets, reps, and intensity"""
-        if workout_type == 'Strength':
-            return {
-                'name': exercise,
-                'sets': int(3 * progression['volume_multiplier']),
-                'reps': int(10 * progression['intensity_multiplier']),
-                'rest': '60-90 seconds'
-            }
-        elif workout_type == 'HIIT':
-            return {
-                'name': exercise,
-                'intervals': int(6 * progression['volume_multiplier']),
-                'work_time': '30 seconds',
-                'rest_time': '30 seconds'
-            }
-        else:
-            # Calculate exact exercise durations
-            # This ensures all exercises add up to exactly the total duration
-            exercise_duration = total_duration_min // num_exercises
-            
-            # Distribute any remaining minutes to early exercises
-            remainder = total_duration_min % num_exercises
-            if exercise_index < remainder:
-                exercise_duration += 1
-                
-            return {
-                'name': exercise,
-                'duration': f"{exercise_duration} minutes"
-            }
-
-    def calculate_duration(self, workout_type: str, fitness_level: FitnessLevel) -> str:
-        """Calculate workout duration based on type and fitness level"""
-        base_duration = {
-            FitnessLevel.BEGINNER: 30,
-            FitnessLevel.INTERMEDIATE: 45,
-            FitnessLevel.ADVANCED: 60
-        }.get(fitness_level, 45)
-
-        if workout_type in ['HIIT', 'Cardio']:
-            base_duration *= 0.8
-
-        return f"{int(base_duration)} minutes"
-
-    def get_required_equipment(self, exercises: List[str]) -> List[str]:
-        """Get list of required equipment for exercises"""
-        equipment = set()
-        for exercise in exercises:
-            if exercise in self.exercise_db.equipment_mapping:
-                equipment.update(self.exercise_db.equipment_mapping[exercise])
-        return list(equipment)
-
-    def generate_daily_challenge(self, user: UserProfile, specific_date: datetime = None) -> Dict:
-        """Generate a daily workout challenge for a specific date"""
-        # Use current date or specified date
-        date = specific_date or datetime.now()
-
-        # Seed random with date and user for consistency
-        random.seed(f"{user.age}{user.fitness_level}{date.strftime('%Y%m%d')}")
-
-        # Calculate day number and week progression
-        day = (date - datetime(2025, 1, 1)).days + 1
-        week = (day - 1) // 7 + 1
-
-        # Get user-specific parameters
-        difficulty = self.calculate_difficulty_modifier(user)
-        goal_data = self.goal_workout_mapping.get(user.goal, self.goal_workout_mapping['Weight Loss'])
-
-        # Select workout type based on weighted distribution
-        available_types = list(goal_data['workout_split'].keys())
-        weights = [goal_data['workout_split'][t] for t in available_types]
-        random.seed(f"{user.age}{user.fitness_level}{date.strftime('%Y%m%d')}{date.weekday()}")
-        workout_type = random.choices(available_types, weights=weights, k=1)[0]
-
-        # Get available exercises (filtered by health conditions)
-        exercises_pool = self.exercise_db.workout_types[workout_type].copy()
-        for condition in user.health_conditions:
-            restricted = self.exercise_db.health_restrictions.get(condition, [])
-            exercises_pool = [e for e in exercises_pool if e not in restricted]
-
-        # Fallback if no suitable exercises
-        if not exercises_pool:
-            exercises_pool = ["Low-Impact Alternative"]
-
-        # Select exercises based on fitness level
-        exercise_count = {
-            FitnessLevel.BEGINNER: 2,
-            FitnessLevel.INTERMEDIATE: 3,
-            FitnessLevel.ADVANCED: 4
-        }.get(user.fitness_level, 2)
-
-        selected_exercises = random.sample(
-            exercises_pool,
-            min(exercise_count, len(exercises_pool))
-        )
-
-        # Calculate total duration
-        total_duration = self.calculate_duration(workout_type, user.fitness_level)
-        total_duration_min = int(total_duration.split()[0])  # Extract minutes as int
-
-        # Format exercises using the corrected approach
-        progression = self.calculate_progression(week, difficulty)
-        
-        formatted_exercises = []
-        for i, exercise in enumerate(selected_exercises):
-            formatted_exercises.append(
-                self.format_exercise(
-                    exercise, 
-                    workout_type, 
-                    progression,
-                    i,  # Pass the exercise index
-                    len(selected_exercises),
-                    total_duration_min
-                )
-            )
-
-        # Day names for challenge titles
-        day_name = date.strftime("%A")
-
-        # Build challenge
-        challenge = {
-            'name': f"{day_name} {workout_type} Challenge",
-            'date': date.strftime("%Y-%m-%d"),
-            'day_of_week': day_name,
-            'type': workout_type,
-            'difficulty': user.fitness_level.value,
-            'exercises': formatted_exercises,
-            'duration': total_duration,
-            'required_equipment': self.get_required_equipment(selected_exercises)
-        }
-
-        return challenge
-
-
-def main():
-    # Create a user profile
-    user = UserProfile(
-        age=45,
-        height=170,
-        weight=85,
-        gender='Female',
-        fitness_level=FitnessLevel.INTERMEDIATE,
-        health_conditions=[HealthCondition.KNEE_PAIN, HealthCondition.BACK_PAIN],
-        goal='Weight Loss',
-        preferred_days=5  # User wants to work out 5 days per week
-    )
-
-    planner = WorkoutPlanner()
-
-    # Generate the regular workout plan
-    workout_plan = planner.generate_workout_plan(user)
-
-    # Print example workout from the plan
-    print("\n=== WEEKLY WORKOUT PLAN ===")
-    week1 = workout_plan['weeks']['Week 1']
-    print(f"\nProgression Level: {week1['progression_level']}")
-    for i, workout in enumerate(week1['workouts'], 1):
-        print(f"\nDay {i}:")
-        print(f"Type: {workout['type']}")
-        print(f"Duration: {workout['duration']}")
-        print(f"Intensity: {workout['intensity']}")
-        print("Exercises:")
-        for exercise in workout['exercises']:
-            if 'sets' in exercise:
-                print(f"- {exercise['name']}: {exercise['sets']} sets x {exercise['reps']} reps")
-            elif 'intervals' in exercise:
-                print(f"- {exercise['name']}: {exercise['intervals']} intervals")
-            else:
-                print(f"- {exercise['name']}: {exercise['duration']}")
-        if workout['required_equipment']:
-            print(f"Required Equipment: {', '.join(workout['required_equipment'])}")
-
-    # Generate and print a single daily challenge
-    print("\n=== DAILY CHALLENGE FOR TODAY ===")
-    daily_challenge = planner.generate_daily_challenge(user)
-
-    print(f"\n{daily_challenge['name']} ({daily_challenge['date']})")
-    print(f"Type: {daily_challenge['type']}")
-    print(f"Difficulty: {daily_challenge['difficulty']}")
-    print(f"Duration: {daily_challenge['duration']}")
-    print("Challenge Exercises:")
-
-    for exercise in daily_challenge['exercises']:
-        if 'sets' in exercise:
-            print(f"- {exercise['name']}: {exercise['sets']} sets x {exercise['reps']} reps, rest {exercise['rest']}")
-        elif 'intervals' in exercise:
-            print(
-                f"- {exercise['name']}: {exercise['intervals']} intervals ({exercise['work_time']} work / {exercise['rest_time']} rest)")
-        else:
-            print(f"- {exercise['name']}: {exercise['duration']}")
-
-    if daily_challenge['required_equipment']:
-        print(f"Required Equipment: {', '.join(daily_challenge['required_equipment'])}")
-
-
-if __name__ == "__main__":
+import bisect
+import itertools
+import random
+import sys
+import threading
+from typing import List, Dict, Tuple
+from collections import namedtuple
+from dataclasses import dataclass
+from datetime import datetime
+from enum import Enum
+from functools import lru_cache
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional; the pure-Python core is used without it
+    njit = None
+
+
+# Reference date for numbering challenge days; built once at import
+_EPOCH_2025 = datetime(2025, 1, 1)
+
+Progression = namedtuple(
+    'Progression',
+    ['volume_multiplier', 'intensity_multiplier', 'complexity_level']
+)
+
+
+class FitnessLevel(str, Enum):
+    BEGINNER = "Beginner"
+    INTERMEDIATE = "Intermediate"
+    ADVANCED = "Advanced"
+
+
+class WorkoutType(str, Enum):
+    CARDIO = "Cardio"
+    STRENGTH = "Strength"
+    FLEXIBILITY = "Flexibility"
+    HIIT = "HIIT"
+
+    def __str__(self):
+        return self.value
+
+
+class HealthCondition(str, Enum):
+    KNEE_PAIN = "Knee Pain"
+    BACK_PAIN = "Back Pain"
+    HEART_CONDITION = "Heart Condition"
+    SHOULDER_INJURY = "Shoulder Injury"
+
+
+# Bit per condition; a frozenset of conditions collapses to a small int
+# that hashes and compares in constant time
+_HC_BIT = {c: 1 << i for i, c in enumerate(HealthCondition)}
+
+
+@lru_cache(maxsize=64)
+def _conditions_mask(conditions: Tuple[HealthCondition, ...]) -> int:
+    """Fold a condition tuple into its bitmask"""
+    mask = 0
+    for c in conditions:
+        mask |= _HC_BIT.get(c, 0)
+    return mask
+
+
+@dataclass(slots=True, frozen=True)
+class UserProfile:
+    age: int
+    height: float
+    weight: float
+    gender: str
+    fitness_level: FitnessLevel
+    health_conditions: Tuple[HealthCondition, ...]
+    goal: str
+    preferred_days: int
+
+
+class ExerciseDatabase:
+    def __init__(self):
+        self.workout_types = {
+            WorkoutType.CARDIO: (
+                'Treadmill', 'Cycling', 'Swimming', 'Rowing', 'Elliptical',
+                'Jump Rope', 'Running', 'Stair Climbing', 'Boxing', 'Kickboxing',
+                'Dancing', 'Mountain Climbers', 'Burpees', 'High Knees'
+            ),
+            WorkoutType.STRENGTH: (
+                'Squats', 'Deadlifts', 'Bench Press', 'Shoulder Press',
+                'Pull-ups', 'Push-ups', 'Lunges', 'Dumbbell Rows',
+                'Leg Press', 'Tricep Dips', 'Bicep Curls', 'Plank Holds',
+                'Romanian Deadlifts', 'Hip Thrusts', 'Face Pulls'
+            ),
+            WorkoutType.FLEXIBILITY: (
+                'Yoga', 'Pilates', 'Dynamic Stretching', 'Static Stretching',
+                'Foam Rolling', 'Mobility Work', 'Cat-Cow Stretch',
+                'Downward Dog', "Child's Pose", 'Hamstring Stretch',
+                'Hip Flexor Stretch', 'Shoulder Rolls', 'Spine Twists'
+            ),
+            WorkoutType.HIIT: (
+                'Burpee Intervals', 'Sprint Intervals', 'Jump Rope Intervals',
+                'Mountain Climber Intervals', 'Squat Jumps', 'Box Jumps',
+                'Battle Ropes', 'Kettlebell Swings', 'Medicine Ball Slams'
+            )
+        }
+
+        self.health_restrictions = {
+            HealthCondition.KNEE_PAIN: frozenset([
+                'Squats', 'Lunges', 'Box Jumps', 'Jump Rope',
+                'Stair Climbing', 'Burpees', 'Mountain Climbers'
+            ]),
+            HealthCondition.BACK_PAIN: frozenset([
+                'Deadlifts', 'Romanian Deadlifts', 'Shoulder Press',
+                'Bench Press', 'Good Mornings'
+            ]),
+            HealthCondition.HEART_CONDITION: frozenset([
+                'HIIT', 'Sprint Intervals', 'Burpee Intervals',
+                'Box Jumps', 'Battle Ropes'
+            ]),
+            HealthCondition.SHOULDER_INJURY: frozenset([
+                'Pull-ups', 'Shoulder Press', 'Bench Press',
+                'Face Pulls', 'Push-ups'
+            ])
+        }
+
+        self.equipment_mapping = {
+            'Treadmill': frozenset(['Treadmill']),
+            'Cycling': frozenset(['Stationary Bike']),
+            'Yoga': frozenset(['Yoga Mat']),
+            'Kettlebell Swings': frozenset(['Kettlebell']),
+            'Box Jumps': frozenset(['Plyo Box']),
+            'Deadlifts': frozenset(['Barbell', 'Weight Plates']),
+            'Squats': frozenset(['Barbell', 'Weight Plates']),
+            'Swimming': frozenset(['Pool Access']),
+            'Rowing': frozenset(['Rowing Machine'])
+        }
+
+
+# Per-fitness-level base values, indexed by _FITNESS_IDX instead of
+# rebuilding a dict literal inside each helper
+_FITNESS_IDX = {
+    FitnessLevel.BEGINNER: 0,
+    FitnessLevel.INTERMEDIATE: 1,
+    FitnessLevel.ADVANCED: 2
+}
+_BASE_MODIFIER = (0.8, 1.1, 1.4)
+_BASE_EXERCISES = (4, 5, 6)
+_BASE_DURATION = (30, 45, 60)
+_BASE_CHALLENGE_EXERCISES = (2, 3, 4)
+
+
+def _difficulty_core(fitness_ordinal: int, has_conditions: bool) -> float:
+    """Numeric core of the difficulty calculation; operates on plain ints"""
+    if fitness_ordinal == 0:
+        base_modifier = 0.8
+    elif fitness_ordinal == 1:
+        base_modifier = 1.1
+    elif fitness_ordinal == 2:
+        base_modifier = 1.4
+    else:
+        base_modifier = 1.0
+
+    # Adjust for health conditions
+    if has_conditions:
+        base_modifier *= 0.9
+
+    return base_modifier
+
+
+if njit is not None:
+    _difficulty_core = njit(cache=True)(_difficulty_core)
+
+
+@lru_cache(maxsize=256)
+def _calculate_difficulty_modifier(fitness_level: FitnessLevel, has_conditions: bool) -> float:
+    """Calculate workout difficulty from fitness level and condition presence (cached)"""
+    idx = _FITNESS_IDX.get(fitness_level)
+    return _difficulty_core(idx if idx is not None else -1, has_conditions)
+
+
+@lru_cache(maxsize=None)
+def _calculate_progression(week: int, difficulty_modifier: float) -> Progression:
+    """Calculate progressive overload for the week (cached; pure function)"""
+    return Progression(
+        volume_multiplier=(1 + (0.1 * (week - 1))) * difficulty_modifier,
+        intensity_multiplier=(1 + (0.05 * (week - 1))) * difficulty_modifier,
+        complexity_level=min(3, 1 + int((week - 1) / 2))
+    )
+
+
+@lru_cache(maxsize=None)
+def _calculate_num_exercises(fitness_level: FitnessLevel, volume_multiplier: float) -> int:
+    """Calculate number of exercises based on fitness level and progression (cached)"""
+    idx = _FITNESS_IDX.get(fitness_level)
+    base_exercises = _BASE_EXERCISES[idx] if idx is not None else 3
+
+    return int(base_exercises * volume_multiplier)
+
+
+@lru_cache(maxsize=None)
+def _calculate_duration(workout_type: str, fitness_level: FitnessLevel) -> str:
+    """Calculate workout duration based on type and fitness level (cached)"""
+    idx = _FITNESS_IDX.get(fitness_level)
+    base_duration = _BASE_DURATION[idx] if idx is not None else 45
+
+    if workout_type in (WorkoutType.HIIT, WorkoutType.CARDIO):
+        base_duration *= 0.8
+
+    return f"{int(base_duration)} minutes"
+
+
+class WorkoutPlanner:
+    def __init__(self):
+        self.exercise_db = ExerciseDatabase()
+        self._rng = np.random.default_rng()
+
+        # Per-thread index buffers reused by _partial_sample, keyed by pool size
+        self._scratch = threading.local()
+        self.goal_workout_mapping = {
+            'Weight Loss': {
+                'primary_type': WorkoutType.CARDIO,
+                'workout_split': {
+                    WorkoutType.CARDIO: 0.50,
+                    WorkoutType.STRENGTH: 0.30,
+                    WorkoutType.HIIT: 0.20
+                },
+                'intensity_range': {
+                    WorkoutType.CARDIO: '65-75% max heart rate',
+                    WorkoutType.STRENGTH: '12-15 reps',
+                    WorkoutType.HIIT: '30 seconds work/30 seconds rest'
+                }
+            },
+            'Muscle Gain': {
+                'primary_type': WorkoutType.STRENGTH,
+                'workout_split': {
+                    WorkoutType.STRENGTH: 0.70,
+                    WorkoutType.CARDIO: 0.15,
+                    WorkoutType.FLEXIBILITY: 0.15
+                },
+                'intensity_range': {
+                    WorkoutType.STRENGTH: '8-12 reps',
+                    WorkoutType.CARDIO: '20-30 minutes low intensity',
+                    WorkoutType.FLEXIBILITY: '15-20 minutes'
+                }
+            },
+            'Endurance': {
+                'primary_type': WorkoutType.CARDIO,
+                'workout_split': {
+                    WorkoutType.CARDIO: 0.60,
+                    WorkoutType.STRENGTH: 0.25,
+                    WorkoutType.FLEXIBILITY: 0.15
+                },
+                'intensity_range': {
+                    WorkoutType.CARDIO: '60-70% max heart rate',
+                    WorkoutType.STRENGTH: '15-20 reps',
+                    WorkoutType.FLEXIBILITY: '20-30 minutes'
+                }
+            },
+            'Flexibility': {
+                'primary_type': WorkoutType.FLEXIBILITY,
+                'workout_split': {
+                    WorkoutType.FLEXIBILITY: 0.60,
+                    WorkoutType.STRENGTH: 0.25,
+                    WorkoutType.CARDIO: 0.15
+                },
+                'intensity_range': {
+                    WorkoutType.FLEXIBILITY: '30-45 minutes',
+                    WorkoutType.STRENGTH: '12-15 reps',
+                    WorkoutType.CARDIO: '20-30 minutes low intensity'
+                }
+            }
+        }
+
+        # Filtered exercise pools keyed by (workout_type, condition set),
+        # built lazily since only a few combinations occur per user
+        self._pool_cache = {}
+        self._restricted_cache = {}
+
+        # Equipment lists keyed by the set of selected exercises; the same
+        # combinations recur across weeks
+        self._equipment_cache = {}
+
+        # Precompute cumulative thresholds per goal so workout-type selection
+        # is a single bisect instead of a linear scan on every call
+        self._split_cache = {}
+        for goal, goal_data in self.goal_workout_mapping.items():
+            types = tuple(goal_data['workout_split'].keys())
+            cums = list(itertools.accumulate(goal_data['workout_split'].values()))
+            self._split_cache[goal] = (types, cums)
+
+    def calculate_difficulty_modifier(self, user: UserProfile) -> float:
+        """Calculate workout difficulty based on user profile"""
+        return _calculate_difficulty_modifier(user.fitness_level, bool(user.health_conditions))
+
+    def generate_workout_plan(self, user: UserProfile, weeks: int = 4) -> Dict:
+        """Generate a complete workout plan based on user profile"""
+        difficulty_modifier = self.calculate_difficulty_modifier(user)
+        goal_data = self.goal_workout_mapping[user.goal]
+
+        workout_plan = {
+            'user_profile': user,
+            'start_date': datetime.now(),
+            'weeks': {}
+        }
+
+        # Draw every day's workout type in one vectorized call rather than
+        # one scalar sample per day
+        types = list(goal_data['workout_split'])
+        probs = np.array(list(goal_data['workout_split'].values()))
+        picks = self._rng.choice(
+            len(types), size=weeks * user.preferred_days, p=probs / probs.sum()
+        ).reshape(weeks, user.preferred_days)
+
+        # Compute every week's progression in one vectorized pass instead of
+        # one scalar calculation per week
+        dm = round(difficulty_modifier, 2)
+        week_nums = np.arange(weeks)
+        volume_mults = (1 + 0.1 * week_nums) * dm
+        intensity_mults = (1 + 0.05 * week_nums) * dm
+        complexity_levels = np.minimum(3, 1 + week_nums // 2)
+
+        for week in range(1, weeks + 1):
+            weekly_plan = []
+            week_progression = Progression(
+                volume_multiplier=float(volume_mults[week - 1]),
+                intensity_multiplier=float(intensity_mults[week - 1]),
+                complexity_level=int(complexity_levels[week - 1])
+            )
+
+            for day in range(user.preferred_days):
+                workout_type = types[picks[week - 1, day]]
+                daily_workout = self.generate_daily_workout(
+                    workout_type=workout_type,
+                    intensity=goal_data['intensity_range'][workout_type],
+                    user=user,
+                    progression=week_progression
+                )
+                weekly_plan.append(daily_workout)
+
+            workout_plan['weeks'][f'Week {week}'] = {
+                'progression_level': week_progression._asdict(),
+                'workouts': weekly_plan
+            }
+
+        return workout_plan
+
+    def calculate_progression(self, week: int, difficulty_modifier: float) -> Progression:
+        """Calculate progressive overload for the week"""
+        # Quantize the modifier so near-identical floats share a cache entry
+        return _calculate_progression(week, round(difficulty_modifier, 2))
+
+    def _get_pool(self, workout_type: str, conditions: List[HealthCondition]) -> tuple:
+        """Get the exercise pool for a workout type, filtered by health conditions.
+
+        Conditions collapse to a bitmask so pool lookups key on a
+        (workout_type, int) pair; pools are computed once per key and
+        reused, so repeated days share the same filtered tuple.
+        """
+        mask = _conditions_mask(tuple(conditions))
+        key = (workout_type, mask)
+        pool = self._pool_cache.get(key)
+        if pool is None:
+            restricted = self._restricted_cache.get(mask)
+            if restricted is None:
+                restricted = frozenset().union(*(
+                    self.exercise_db.health_restrictions.get(c, frozenset())
+                    for c, bit in _HC_BIT.items() if mask & bit
+                ))
+                self._restricted_cache[mask] = restricted
+            pool = tuple(
+                e for e in self.exercise_db.workout_types[workout_type]
+                if e not in restricted
+            )
+            self._pool_cache[key] = pool
+        return pool
+
+    def _partial_sample(self, rng, pool, k: int) -> List[str]:
+        """Select k distinct items via a partial Fisher-Yates shuffle.
+
+        random.sample does O(n) setup per call even for small k; this swaps
+        only the first k slots of a persistent per-size index buffer and
+        undoes the swaps afterwards, so the buffer is always in identity
+        order on entry and seeded draws stay reproducible. Buffers are
+        thread-local so concurrent requests do not share state.
+        """
+        n = len(pool)
+        buffers = getattr(self._scratch, 'buffers', None)
+        if buffers is None:
+            buffers = self._scratch.buffers = {}
+        indices = buffers.get(n)
+        if indices is None:
+            indices = buffers[n] = list(range(n))
+
+        rand = rng.random
+        swaps = []
+        for i in range(k):
+            j = i + int(rand() * (n - i))
+            indices[i], indices[j] = indices[j], indices[i]
+            swaps.append((i, j))
+        selected = [pool[indices[i]] for i in range(k)]
+
+        # Undo the swaps (reverse order) to restore identity order
+        for i, j in reversed(swaps):
+            indices[i], indices[j] = indices[j], indices[i]
+        return selected
+
+    def select_workout_type(self, goal: str) -> str:
+        """Select workout type based on the goal's split probabilities"""
+        types, cums = self._split_cache[goal]
+        index = bisect.bisect(cums, random.random() * cums[-1])
+        return types[min(index, len(types) - 1)]  # Clamp guards float edge cases
+
+    def generate_daily_workout(self, workout_type: str, intensity: str,
+                                user: UserProfile, progression: Dict) -> Dict:
+        """Generate a single day's workout"""
+        exercises_pool = self._get_pool(workout_type, user.health_conditions)
+
+        # Fallback if all exercises are filtered out
+        if not exercises_pool:
+            exercises_pool = ("Low-Impact Walking" if workout_type == WorkoutType.CARDIO
+                              else "Bodyweight Isometric Holds",)
+
+        num_exercises = self.calculate_num_exercises(user.fitness_level, progression)
+
+        selected_exercises = self._partial_sample(
+            random, exercises_pool, min(num_exercises, len(exercises_pool))
+        )
+
+        # Calculate total duration
+        total_duration = self.calculate_duration(workout_type, user.fitness_level)
+        total_duration_min = int(total_duration.split()[0])  # Extract minutes as int
+
+        counts = self._exercise_counts(progression)
+        formatted_exercises = self.format_exercises(
+            selected_exercises, workout_type, counts, total_duration_min
+        )
+
+        return {
+            'type': workout_type,
+            'intensity': intensity,
+            'exercises': formatted_exercises,
+            'duration': total_duration,
+            'required_equipment': self.get_required_equipment(selected_exercises)
+        }
+
+    def calculate_num_exercises(self, fitness_level: FitnessLevel, progression: Progression) -> int:
+        """Calculate number of exercises based on fitness level and progression"""
+        return _calculate_num_exercises(fitness_level, progression.volume_multiplier)
+
+    @staticmethod
+    def _exercise_counts(progression: Progression) -> tuple:
+        """Compute the day's (sets, reps, intervals) once for all exercises"""
+        return (
+            int(3 * progression.volume_multiplier),
+            int(10 * progression.intensity_multiplier),
+            int(6 * progression.volume_multiplier)
+        )
+
+    def format_exercises(self, exercises: List[str], workout_type: str, counts: tuple,
+                         total_duration_min: int) -> List[Dict]:
+        """Format a day's exercises with sets, reps, and intensity
+
+        Within a day only the exercise name varies for Strength and HIIT
+        work, so a single template dict is built once and copied per
+        exercise instead of reconstructing every key.
+        """
+        sets, reps, intervals = counts
+        if workout_type == WorkoutType.STRENGTH:
+            template = {'sets': sets, 'reps': reps, 'rest': '60-90 seconds'}
+            return [{'name': e, **template} for e in exercises]
+        elif workout_type == WorkoutType.HIIT:
+            template = {'intervals': intervals, 'work_time': '30 seconds',
+                        'rest_time': '30 seconds'}
+            return [{'name': e, **template} for e in exercises]
+        else:
+            # Calculate exact exercise durations
+            # This ensures all exercises add up to exactly the total duration,
+            # distributing any remaining minutes to early exercises
+            base_duration, remainder = divmod(total_duration_min, len(exercises))
+            return [
+                {'name': e,
+                 'duration': f"{base_duration + 1 if i < remainder else base_duration} minutes"}
+                for i, e in enumerate(exercises)
+            ]
+
+    def calculate_duration(self, workout_type: str, fitness_level: FitnessLevel) -> str:
+        """Calculate workout duration based on type and fitness level"""
+        return _calculate_duration(workout_type, fitness_level)
+
+    def get_required_equipment(self, exercises: List[str]) -> Tuple[str, ...]:
+        """Get the required equipment for exercises as an immutable tuple"""
+        key = frozenset(exercises)
+        equipment = self._equipment_cache.get(key)
+        if equipment is None:
+            em = self.exercise_db.equipment_mapping
+            equipment = tuple(frozenset().union(*(em.get(e, frozenset()) for e in key)))
+            self._equipment_cache[key] = equipment
+        return equipment
+
+    def generate_daily_challenge(self, user: UserProfile, specific_date: datetime = None) -> Dict:
+        """Generate a daily workout challenge for a specific date"""
+        # Use current date or specified date
+        date = specific_date or datetime.now()
+        difficulty = self.calculate_difficulty_modifier(user)
+        types, cums = self._split_cache.get(user.goal) or self._split_cache['Weight Loss']
+        return self._build_daily_challenge(user, date, difficulty, types, cums)
+
+    def generate_daily_challenges_batch(self, user: UserProfile, dates: List[datetime]) -> List[Dict]:
+        """Generate challenges for many dates at once.
+
+        The per-user invariants (difficulty modifier, goal split thresholds)
+        are computed a single time and shared across all dates; each date
+        still gets its own deterministically seeded draw, so the results
+        match calling generate_daily_challenge date by date.
+        """
+        difficulty = self.calculate_difficulty_modifier(user)
+        types, cums = self._split_cache.get(user.goal) or self._split_cache['Weight Loss']
+        return [
+            self._build_daily_challenge(user, date, difficulty, types, cums)
+            for date in dates
+        ]
+
+    def _build_daily_challenge(self, user: UserProfile, date: datetime,
+                               difficulty: float, types: tuple, cums: list) -> Dict:
+        """Build one challenge for an already-resolved date and goal split"""
+        # Format the date pieces once; strftime is surprisingly costly when
+        # challenges are generated for many dates
+        ymd = date.strftime('%Y%m%d')
+        weekday = date.weekday()
+        day_name = date.strftime("%A")
+        date_str = date.strftime("%Y-%m-%d")
+
+        # Hoist the enum lookups; descriptor access is slow enough to show
+        # up when many challenges are generated
+        fitness_level = user.fitness_level
+        level_str = str(fitness_level)
+
+        # Dedicated RNG seeded from date and user for consistency; keeps the
+        # module-level random state untouched for other callers
+        rng = random.Random(f"{user.age}{level_str}{ymd}{weekday}")
+
+        # Calculate day number and week progression
+        day = (date - _EPOCH_2025).days + 1
+        week = (day - 1) // 7 + 1
+
+        # Select workout type via the precomputed cumulative thresholds
+        index = bisect.bisect(cums, rng.random() * cums[-1])
+        workout_type = types[min(index, len(types) - 1)]
+
+        # Get available exercises (filtered by health conditions)
+        exercises_pool = self._get_pool(workout_type, user.health_conditions)
+
+        # Fallback if no suitable exercises
+        if not exercises_pool:
+            exercises_pool = ("Low-Impact Alternative",)
+
+        # Select exercises based on fitness level
+        idx = _FITNESS_IDX.get(fitness_level)
+        exercise_count = _BASE_CHALLENGE_EXERCISES[idx] if idx is not None else 2
+
+        selected_exercises = self._partial_sample(
+            rng, exercises_pool, min(exercise_count, len(exercises_pool))
+        )
+
+        # Calculate total duration
+        total_duration = self.calculate_duration(workout_type, fitness_level)
+        total_duration_min = int(total_duration.split()[0])  # Extract minutes as int
+
+        # Format exercises using the corrected approach
+        progression = self.calculate_progression(week, difficulty)
+
+        counts = self._exercise_counts(progression)
+        formatted_exercises = self.format_exercises(
+            selected_exercises, workout_type, counts, total_duration_min
+        )
+
+        # Build challenge
+        challenge = {
+            'name': f"{day_name} {workout_type} Challenge",
+            'date': date_str,
+            'day_of_week': day_name,
+            'type': workout_type,
+            'difficulty': fitness_level.value,
+            'exercises': formatted_exercises,
+            'duration': total_duration,
+            'required_equipment': self.get_required_equipment(selected_exercises)
+        }
+
+        return challenge
+
+
+def main():
+    # Create a user profile
+    user = UserProfile(
+        age=45,
+        height=170,
+        weight=85,
+        gender='Female',
+        fitness_level=FitnessLevel.INTERMEDIATE,
+        health_conditions=(HealthCondition.KNEE_PAIN, HealthCondition.BACK_PAIN),
+        goal='Weight Loss',
+        preferred_days=5  # User wants to work out 5 days per week
+    )
+
+    planner = WorkoutPlanner()
+
+    # Generate the regular workout plan
+    workout_plan = planner.generate_workout_plan(user)
+
+    # Build the full report and emit it with a single write instead of one
+    # print call (and stdout flush) per line
+    parts = []
+
+    # Example workout from the plan
+    parts.append("\n=== WEEKLY WORKOUT PLAN ===\n")
+    week1 = workout_plan['weeks']['Week 1']
+    parts.append(f"\nProgression Level: {week1['progression_level']}\n")
+    for i, workout in enumerate(week1['workouts'], 1):
+        parts.append(f"\nDay {i}:\n")
+        parts.append(f"Type: {workout['type']}\n")
+        parts.append(f"Duration: {workout['duration']}\n")
+        parts.append(f"Intensity: {workout['intensity']}\n")
+        parts.append("Exercises:\n")
+        for exercise in workout['exercises']:
+            if 'sets' in exercise:
+                parts.append(f"- {exercise['name']}: {exercise['sets']} sets x {exercise['reps']} reps\n")
+            elif 'intervals' in exercise:
+                parts.append(f"- {exercise['name']}: {exercise['intervals']} intervals\n")
+            else:
+                parts.append(f"- {exercise['name']}: {exercise['duration']}\n")
+        if workout['required_equipment']:
+            parts.append(f"Required Equipment: {', '.join(workout['required_equipment'])}\n")
+
+    # Generate a single daily challenge
+    parts.append("\n=== DAILY CHALLENGE FOR TODAY ===\n")
+    daily_challenge = planner.generate_daily_challenge(user)
+
+    parts.append(f"\n{daily_challenge['name']} ({daily_challenge['date']})\n")
+    parts.append(f"Type: {daily_challenge['type']}\n")
+    parts.append(f"Difficulty: {daily_challenge['difficulty']}\n")
+    parts.append(f"Duration: {daily_challenge['duration']}\n")
+    parts.append("Challenge Exercises:\n")
+
+    for exercise in daily_challenge['exercises']:
+        if 'sets' in exercise:
+            parts.append(f"- {exercise['name']}: {exercise['sets']} sets x {exercise['reps']} reps, rest {exercise['rest']}\n")
+        elif 'intervals' in exercise:
+            parts.append(
+                f"- {exercise['name']}: {exercise['intervals']} intervals ({exercise['work_time']} work / {exercise['rest_time']} rest)\n")
+        else:
+            parts.append(f"- {exercise['name']}: {exercise['duration']}\n")
+
+    if daily_challenge['required_equipment']:
+        parts.append(f"Required Equipment: {', '.join(daily_challenge['required_equipment'])}\n")
+
+    sys.stdout.write("".join(parts))
+
+
+if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -1,360 +1,502 @@
-from flask import Flask, request, jsonify
-from datetime import datetime, timedelta
-import dateutil.parser
-from Exercise import UserProfile, WorkoutPlanner, FitnessLevel, HealthCondition
-
-app = Flask(__name__)
-planner = WorkoutPlanner()
-
-# Standardized error responses
-def error_response(message, status_code=400):
-    """Create a standardized error response"""
-    return jsonify({
-        'error': True,
-        'message': message
-    }), status_code
-
-# Error handling
-@app.errorhandler(400)
-def bad_request(error):
-    return error_response(str(error), 400)
-
-@app.errorhandler(404)
-def not_found(error):
-    return error_response(str(error), 404)
-
-# Routes
-@app.route('/api/health', methods=['GET'])
-def health_check():
-    """Basic health check endpoint"""
-    return jsonify({
-        'status': 'healthy',
-        'timestamp': datetime.now().isoformat()
-    })
-
-@app.route('/api/exercises', methods=['GET'])
-def get_exercises():
-    """Get all available exercises"""
-    exercise_type = request.args.get('type')
-    if exercise_type:
-        # Make sure type matches exactly what's in exercise_db.workout_types
-        # (Cardio, Strength, Flexibility, HIIT)
-        if exercise_type in planner.exercise_db.workout_types:
-            return jsonify({
-                'exercises': planner.exercise_db.workout_types[exercise_type]
-            })
-    return jsonify({
-        'exercises': planner.exercise_db.workout_types
-    })
-
-@app.route('/api/workout-types', methods=['GET'])
-def get_workout_types():
-    """Get available workout types and their exercises"""
-    return jsonify({
-        'workout_types': list(planner.exercise_db.workout_types.keys())
-    })
-
-@app.route('/api/equipment', methods=['GET'])
-def get_equipment():
-    """Get equipment mappings"""
-    return jsonify({
-        'equipment_mapping': planner.exercise_db.equipment_mapping
-    })
-
-@app.route('/api/goals', methods=['GET'])
-def get_goals():
-    """Get available fitness goals and their workout splits"""
-    return jsonify({
-        'goals': list(planner.goal_workout_mapping.keys())
-    })
-
-def standardize_fitness_level(level):
-    """Convert any fitness level string to FitnessLevel enum"""
-    if isinstance(level, FitnessLevel):
-        return level
-        
-    level_map = {
-        "beginner": FitnessLevel.BEGINNER,
-        "intermediate": FitnessLevel.INTERMEDIATE, 
-        "advanced": FitnessLevel.ADVANCED
-    }
-    
-    if isinstance(level, str):
-        level_lower = level.lower().strip()
-        return level_map.get(level_lower, FitnessLevel.INTERMEDIATE)
-    
-    return FitnessLevel.INTERMEDIATE
-
-def standardize_health_conditions(conditions):
-    """Standardize health conditions to match HealthCondition enum"""
-    if not conditions:
-        return []
-    
-    if isinstance(conditions, str):
-        conditions = [conditions]
-    
-    condition_map = {
-        "knee pain": HealthCondition.KNEE_PAIN,
-        "knee": HealthCondition.KNEE_PAIN,
-        "back pain": HealthCondition.BACK_PAIN,
-        "back": HealthCondition.BACK_PAIN,
-        "heart condition": HealthCondition.HEART_CONDITION,
-        "heart": HealthCondition.HEART_CONDITION,
-        "shoulder injury": HealthCondition.SHOULDER_INJURY,
-        "shoulder": HealthCondition.SHOULDER_INJURY
-    }
-    
-    standardized = []
-    for condition in conditions:
-        if isinstance(condition, str):
-            condition_lower = condition.lower().strip()
-            if condition_lower in condition_map:
-                standardized.append(condition_map[condition_lower])
-            else:
-                # Try to match directly with enum values
-                try:
-                    standardized.append(HealthCondition(condition))
-                except ValueError:
-                    # Skip invalid conditions
-                    pass
-        elif isinstance(condition, HealthCondition):
-            standardized.append(condition)
-    
-    return standardized
-
-def standardize_goal(goal):
-    """Make sure goal matches one of the keys in goal_workout_mapping"""
-    if not goal:
-        return "Weight Loss"  # Default
-        
-    goal_map = {
-        "weight_loss": "Weight Loss",
-        "weightloss": "Weight Loss",
-        "weight loss": "Weight Loss",
-        "muscle_gain": "Muscle Gain",
-        "musclegain": "Muscle Gain", 
-        "muscle gain": "Muscle Gain",
-        "endurance": "Endurance",
-        "flexibility": "Flexibility"
-    }
-    
-    if isinstance(goal, str):
-        goal_lower = goal.lower().strip()
-        return goal_map.get(goal_lower, goal)
-    
-    return goal
-
-def parse_date(date_str):
-    """Parse and validate a date string"""
-    try:
-        return dateutil.parser.parse(date_str)
-    except ValueError:
-        raise ValueError("Date should be in ISO format (YYYY-MM-DD)")
-
-def validate_user_data(data):
-    """Validate user data and standardize formats"""
-    # Validate required fields
-    required_fields = ['age', 'height', 'weight', 'gender', 'fitness_level',
-                       'goal', 'preferred_days']
-    missing_fields = [field for field in required_fields if field not in data]
-    if missing_fields:
-        return False, f"Missing required fields: {', '.join(missing_fields)}"
-    
-    # Type checking
-    try:
-        data['age'] = int(data['age'])
-        data['height'] = float(data['height'])
-        data['weight'] = float(data['weight'])
-    except (ValueError, TypeError):
-        return False, "Age must be an integer, height and weight must be numeric"
-    
-    # Standardize values to match Exercise.py expectations
-    data['fitness_level'] = standardize_fitness_level(data['fitness_level'])
-    data['health_conditions'] = standardize_health_conditions(data.get('health_conditions', []))
-    data['goal'] = standardize_goal(data['goal'])
-    
-    # Handle preferred_days - needs to be an integer for UserProfile
-    if isinstance(data['preferred_days'], list):
-        data['preferred_days'] = len(data['preferred_days'])
-    elif not isinstance(data['preferred_days'], int):
-        try:
-            data['preferred_days'] = int(data['preferred_days'])
-        except (ValueError, TypeError):
-            data['preferred_days'] = 3  # Default to 3 days
-    
-    return True, data
-
-@app.route('/api/generate-plan', methods=['POST'])
-def generate_workout_plan():
-    """Generate a workout plan based on user profile"""
-    try:
-        data = request.get_json()
-        
-        # Validate and standardize data
-        is_valid, result = validate_user_data(data)
-        if not is_valid:
-            return error_response(result)
-        
-        data = result  # Update with standardized data
-
-        # Create user profile
-        user = UserProfile(
-            age=data['age'],
-            height=data['height'],
-            weight=data['weight'],
-            gender=data['gender'],
-            fitness_level=data['fitness_level'],
-            health_conditions=data['health_conditions'],
-            goal=data['goal'],
-            preferred_days=data['preferred_days']
-        )
-
-        # Generate plan
-        weeks = data.get('weeks', 4)  # Default to 4 weeks if not specified
-        workout_plan = planner.generate_workout_plan(user, weeks=weeks)
-
-        return jsonify({
-            'workout_plan': workout_plan
-        })
-
-    except Exception as e:
-        return error_response(f"Failed to generate workout plan: {str(e)}")
-
-@app.route('/api/calculate-difficulty', methods=['POST'])
-def calculate_difficulty():
-    """Calculate workout difficulty based on user profile"""
-    try:
-        data = request.get_json()
-        
-        # Validate and standardize data
-        is_valid, result = validate_user_data(data)
-        if not is_valid:
-            return error_response(result)
-        
-        data = result  # Update with standardized data
-        
-        user = UserProfile(
-            age=data['age'],
-            height=data['height'],
-            weight=data['weight'],
-            gender=data['gender'],
-            fitness_level=data['fitness_level'],
-            health_conditions=data['health_conditions'],
-            goal=data['goal'],
-            preferred_days=data['preferred_days']
-        )
-
-        difficulty = planner.calculate_difficulty_modifier(user)
-        return jsonify({
-            'difficulty_modifier': difficulty
-        })
-
-    except Exception as e:
-        return error_response(f"Failed to calculate difficulty: {str(e)}")
-
-@app.route('/api/daily-challenge', methods=['POST'])
-def get_daily_challenge():
-    """Generate a daily workout challenge based on user profile and optional date"""
-    try:
-        data = request.get_json()
-        
-        # Validate and standardize data
-        is_valid, result = validate_user_data(data)
-        if not is_valid:
-            return error_response(result)
-        
-        data = result  # Update with standardized data
-
-        # Create user profile
-        user = UserProfile(
-            age=data['age'],
-            height=data['height'],
-            weight=data['weight'],
-            gender=data['gender'],
-            fitness_level=data['fitness_level'],
-            health_conditions=data['health_conditions'],
-            goal=data['goal'],
-            preferred_days=data['preferred_days']
-        )
-
-        # Check if specific date is provided
-        specific_date = None
-        if 'date' in data and data['date']:
-            try:
-                specific_date = parse_date(data['date'])
-            except ValueError as e:
-                return error_response(str(e))
-
-        # Generate daily challenge
-        daily_challenge = planner.generate_daily_challenge(user, specific_date)
-
-        return jsonify({
-            'daily_challenge': daily_challenge
-        })
-
-    except Exception as e:
-        return error_response(f"Failed to generate daily challenge: {str(e)}")
-
-@app.route('/api/daily-challenges-batch', methods=['POST'])
-def get_daily_challenges_batch():
-    """Generate multiple daily challenges for a date range"""
-    try:
-        data = request.get_json()
-        
-        # Validate and standardize user data
-        is_valid, result = validate_user_data(data)
-        if not is_valid:
-            return error_response(result)
-        
-        data = result  # Update with standardized data
-        
-        # Validate date fields
-        if 'start_date' not in data or 'end_date' not in data:
-            return error_response("Missing required fields: start_date and end_date")
-
-        # Parse dates
-        try:
-            start_date = parse_date(data['start_date'])
-            end_date = parse_date(data['end_date'])
-        except ValueError as e:
-            return error_response(str(e))
-
-        if start_date > end_date:
-            return error_response("Start date must be before or equal to end date")
-
-        # Create user profile
-        user = UserProfile(
-            age=data['age'],
-            height=data['height'],
-            weight=data['weight'],
-            gender=data['gender'],
-            fitness_level=data['fitness_level'],
-            health_conditions=data['health_conditions'],
-            goal=data['goal'],
-            preferred_days=data['preferred_days']
-        )
-
-        # Generate a challenge for each date in the range
-        challenges = []
-        current_date = start_date
-        days_limit = 31  # Limit to prevent excessive processing
-        day_count = 0
-
-        while current_date <= end_date and day_count < days_limit:
-            challenge = planner.generate_daily_challenge(user, current_date)
-            challenges.append(challenge)
-
-            # Move to next day (safer date increment)
-            current_date = current_date + timedelta(days=1)
-            day_count += 1
-
-        return jsonify({
-            'daily_challenges': challenges,
-            'count': len(challenges)
-        })
-
-    except Exception as e:
-        return error_response(f"Failed to generate daily challenges batch: {str(e)}")
-
-if __name__ == '__main__':
-    app.run(host='0.0.0.0', port=8000, debug=True)
\ No newline at end of file
+import json
+import sys
+import threading
+import time
+
+from flask import Flask, request, Response, stream_with_context
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from functools import lru_cache, wraps
+import dateutil.parser
+from Exercise import UserProfile, WorkoutPlanner, FitnessLevel, HealthCondition
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional accelerator
+    orjson = None
+
+app = Flask(__name__)
+planner = WorkoutPlanner()
+
+# Shared pool for fanning out batch challenge generation; cold dates run
+# in parallel while cached ones return immediately
+_EXECUTOR = ThreadPoolExecutor(max_workers=8)
+
+# The exercise database and goal mapping are populated once in
+# WorkoutPlanner's constructor and never mutated afterwards, so the
+# static GET payloads are serialized once at import time and served as
+# raw bytes; any future in-place mutation of those dicts would need to
+# rebuild these
+_EXERCISES_ALL_JSON = json.dumps({
+    'exercises': {str(t): list(v) for t, v in planner.exercise_db.workout_types.items()}
+}).encode()
+_EXERCISES_BY_TYPE_JSON = {
+    str(t): json.dumps({'exercises': list(v)}).encode()
+    for t, v in planner.exercise_db.workout_types.items()
+}
+_WORKOUT_TYPES_JSON = json.dumps({
+    'workout_types': [str(t) for t in planner.exercise_db.workout_types]
+}).encode()
+_EQUIPMENT_JSON = json.dumps({
+    'equipment_mapping': {e: sorted(eq) for e, eq in planner.exercise_db.equipment_mapping.items()}
+}).encode()
+_GOALS_JSON = json.dumps({
+    'goals': list(planner.goal_workout_mapping.keys())
+}).encode()
+
+def get_request_json():
+    """Decode the request body, preferring orjson when installed
+
+    Returns None for a missing or malformed JSON body.
+    """
+    if orjson is not None:
+        try:
+            return orjson.loads(request.get_data() or b'{}')
+        except orjson.JSONDecodeError:
+            return None
+    return request.get_json(silent=True)
+
+def json_response(obj, status=200):
+    """Serialize a response, preferring orjson when installed"""
+    if orjson is not None:
+        payload = orjson.dumps(obj)
+    else:
+        payload = app.json.dumps(obj)
+    return Response(payload, status=status, mimetype='application/json')
+
+def static_json_response(payload):
+    """Serve a pre-serialized static payload"""
+    response = Response(payload, mimetype='application/json')
+    response.headers['Cache-Control'] = 'public, max-age=3600'
+    return response
+
+# Response objects for /api/exercises, built once; Flask treats returned
+# Response instances as already-final, so reusing them is safe for these
+# static payloads
+_EXERCISES_ALL_RESPONSE = static_json_response(_EXERCISES_ALL_JSON)
+_EXERCISES_BY_TYPE_RESPONSE = {
+    t: static_json_response(payload) for t, payload in _EXERCISES_BY_TYPE_JSON.items()
+}
+_WORKOUT_TYPES_RESPONSE = static_json_response(_WORKOUT_TYPES_JSON)
+_EQUIPMENT_RESPONSE = static_json_response(_EQUIPMENT_JSON)
+_GOALS_RESPONSE = static_json_response(_GOALS_JSON)
+
+# Standardized error responses
+def error_response(message, status_code=400):
+    """Create a standardized error response"""
+    return json_response({
+        'error': True,
+        'message': message
+    }, status_code)
+
+# Error handling
+@app.errorhandler(400)
+def bad_request(error):
+    return error_response(str(error), 400)
+
+@app.errorhandler(404)
+def not_found(error):
+    return error_response(str(error), 404)
+
+# Routes
+# Liveness probes hit /api/health many times per second; the payload only
+# changes at second granularity, so rebuild it at most once per tick
+_HEALTH_CACHE = [0, b'']
+
+@app.route('/api/health', methods=['GET'])
+def health_check():
+    """Basic health check endpoint"""
+    now = int(time.time())
+    if _HEALTH_CACHE[0] != now:
+        _HEALTH_CACHE[0] = now
+        _HEALTH_CACHE[1] = json.dumps({
+            'status': 'healthy',
+            'timestamp': datetime.fromtimestamp(now).isoformat()
+        }).encode()
+    return Response(_HEALTH_CACHE[1], mimetype='application/json')
+
+@app.route('/api/exercises', methods=['GET'])
+def get_exercises():
+    """Get all available exercises"""
+    exercise_type = request.args.get('type')
+    if exercise_type:
+        # Make sure type matches exactly what's in exercise_db.workout_types
+        # (Cardio, Strength, Flexibility, HIIT)
+        response = _EXERCISES_BY_TYPE_RESPONSE.get(exercise_type)
+        if response is not None:
+            return response
+    return _EXERCISES_ALL_RESPONSE
+
+@app.route('/api/workout-types', methods=['GET'])
+def get_workout_types():
+    """Get available workout types and their exercises"""
+    return _WORKOUT_TYPES_RESPONSE
+
+@app.route('/api/equipment', methods=['GET'])
+def get_equipment():
+    """Get equipment mappings"""
+    return _EQUIPMENT_RESPONSE
+
+@app.route('/api/goals', methods=['GET'])
+def get_goals():
+    """Get available fitness goals and their workout splits"""
+    return _GOALS_RESPONSE
+
+# Normalization tables and the required-field set are built once at module
+# scope instead of being re-allocated inside each call
+_LEVEL_MAP = {
+    "beginner": FitnessLevel.BEGINNER,
+    "intermediate": FitnessLevel.INTERMEDIATE,
+    "advanced": FitnessLevel.ADVANCED
+}
+
+_CONDITION_MAP = {
+    "knee pain": HealthCondition.KNEE_PAIN,
+    "knee": HealthCondition.KNEE_PAIN,
+    "back pain": HealthCondition.BACK_PAIN,
+    "back": HealthCondition.BACK_PAIN,
+    "heart condition": HealthCondition.HEART_CONDITION,
+    "heart": HealthCondition.HEART_CONDITION,
+    "shoulder injury": HealthCondition.SHOULDER_INJURY,
+    "shoulder": HealthCondition.SHOULDER_INJURY
+}
+
+_GOAL_MAP = {
+    "weight_loss": "Weight Loss",
+    "weightloss": "Weight Loss",
+    "weight loss": "Weight Loss",
+    "muscle_gain": "Muscle Gain",
+    "musclegain": "Muscle Gain",
+    "muscle gain": "Muscle Gain",
+    "endurance": "Endurance",
+    "flexibility": "Flexibility"
+}
+
+_REQUIRED_FIELDS = frozenset({'age', 'height', 'weight', 'gender',
+                              'fitness_level', 'goal', 'preferred_days'})
+
+def standardize_fitness_level(level):
+    """Convert any fitness level string to FitnessLevel enum"""
+    if isinstance(level, str):
+        # Fast path: most clients already send the canonical lowercase form,
+        # so try the raw string before paying for lower().strip()
+        standardized = _LEVEL_MAP.get(level)
+        if standardized is not None:
+            return standardized
+        return _LEVEL_MAP.get(level.lower().strip(), FitnessLevel.INTERMEDIATE)
+
+    if isinstance(level, FitnessLevel):
+        return level
+
+    return FitnessLevel.INTERMEDIATE
+
+_HC_VALUE_TO_ENUM = {c.value: c for c in HealthCondition}
+
+def standardize_health_conditions(conditions):
+    """Standardize health conditions to match HealthCondition enum"""
+    if not conditions:
+        return []
+    
+    if isinstance(conditions, str):
+        conditions = (conditions,)
+    
+    # Dict keys dedup while preserving order; unknown conditions are skipped
+    standardized = {}
+    for condition in conditions:
+        if isinstance(condition, HealthCondition):
+            standardized[condition] = None
+        elif isinstance(condition, str):
+            match = (_CONDITION_MAP.get(condition.lower().strip())
+                     or _HC_VALUE_TO_ENUM.get(condition))
+            if match is not None:
+                standardized[match] = None
+    
+    return list(standardized)
+
+def standardize_goal(goal):
+    """Make sure goal matches one of the keys in goal_workout_mapping"""
+    if not goal:
+        return "Weight Loss"  # Default
+
+    if isinstance(goal, str):
+        # Fast path for canonical spellings before normalizing
+        standardized = _GOAL_MAP.get(goal)
+        if standardized is not None:
+            return standardized
+        return _GOAL_MAP.get(goal.lower().strip(), goal)
+
+    return goal
+
+@lru_cache(maxsize=4096)
+def parse_date(date_str):
+    """Parse and validate a date string (cached)"""
+    # Nearly every client sends a bare YYYY-MM-DD; build that shape with
+    # three int() calls before falling through to the general parsers
+    if len(date_str) == 10 and date_str[4] == '-' and date_str[7] == '-':
+        try:
+            return datetime(int(date_str[:4]), int(date_str[5:7]), int(date_str[8:10]))
+        except ValueError:
+            pass
+    # fromisoformat handles the rest of the ISO contract far faster than
+    # dateutil's heuristic parser, which stays as a fallback for the
+    # looser formats older clients send
+    try:
+        return datetime.fromisoformat(date_str)
+    except ValueError:
+        pass
+    try:
+        return dateutil.parser.parse(date_str)
+    except ValueError:
+        raise ValueError("Date should be in ISO format (YYYY-MM-DD)")
+
+@dataclass(frozen=True, slots=True)
+class ValidatedInput:
+    """Coerced request fields; hashable, so it feeds the profile cache directly"""
+    age: int
+    height: float
+    weight: float
+    gender: str
+    fitness_level: str
+    health_conditions: tuple
+    goal: str
+    preferred_days: int
+
+def validate_user_data(data):
+    """Validate user data, returning (True, ValidatedInput) or (False, message)
+
+    The request dict is read-only here; coerced values land in the frozen
+    ValidatedInput instead of being written back into the caller's dict.
+    """
+    # Validate required fields
+    missing_fields = _REQUIRED_FIELDS.difference(data)
+    if missing_fields:
+        return False, f"Missing required fields: {', '.join(sorted(missing_fields))}"
+    
+    # Type checking
+    try:
+        age = int(data['age'])
+        height = float(data['height'])
+        weight = float(data['weight'])
+    except (ValueError, TypeError):
+        return False, "Age must be an integer, height and weight must be numeric"
+    
+    # Handle preferred_days - needs to be an integer for UserProfile
+    preferred_days = data['preferred_days']
+    if isinstance(preferred_days, list):
+        preferred_days = len(preferred_days)
+    elif not isinstance(preferred_days, int):
+        try:
+            preferred_days = int(preferred_days)
+        except (ValueError, TypeError):
+            preferred_days = 3  # Default to 3 days
+    
+    conditions = data.get('health_conditions') or []
+    if isinstance(conditions, str):
+        conditions = [conditions]
+    
+    # Sort so the profile-cache key is stable regardless of client ordering
+    return True, ValidatedInput(
+        age=age,
+        height=height,
+        weight=weight,
+        gender=str(data['gender']),
+        fitness_level=str(data['fitness_level']),
+        health_conditions=tuple(sorted(map(str, conditions))),
+        goal=str(data['goal']),
+        preferred_days=preferred_days
+    )
+
+@lru_cache(maxsize=1024)
+def _build_user_profile(age, height, weight, gender, fitness_level, conditions, goal, preferred_days):
+    """Standardize fields and build a UserProfile (cached)
+
+    Keyed on the canonicalized field tuple, so repeated submissions of the
+    same payload skip both the standardization work and the profile
+    allocation. UserProfile is frozen, making the cached instance safe to
+    share between requests.
+    """
+    # Intern the free-form strings: the validated values come from a small
+    # finite set, so interning keeps one shared copy and makes later dict
+    # lookups and equality checks pointer comparisons
+    return UserProfile(
+        age=age,
+        height=height,
+        weight=weight,
+        gender=sys.intern(gender) if isinstance(gender, str) else gender,
+        fitness_level=standardize_fitness_level(fitness_level),
+        health_conditions=tuple(standardize_health_conditions(list(conditions))),
+        goal=sys.intern(standardize_goal(goal)),
+        preferred_days=preferred_days
+    )
+
+def user_from_data(validated):
+    """Build (or fetch the cached) UserProfile from a ValidatedInput"""
+    return _build_user_profile(
+        validated.age, validated.height, validated.weight, validated.gender,
+        validated.fitness_level, validated.health_conditions,
+        validated.goal, validated.preferred_days
+    )
+
+# Bounded LRU of generated challenges; the same (user, date) recurs both
+# within batch requests and across repeat clients
+_CHALLENGE_CACHE = OrderedDict()
+_CHALLENGE_CACHE_SIZE = 4096
+_CHALLENGE_CACHE_LOCK = threading.Lock()
+
+def cached_challenge(user, date):
+    """Fetch or generate the daily challenge for (user, date)
+
+    The OrderedDict is shared across waitress threads and the batch
+    executor, so the read-bump and insert-evict sequences each hold a
+    lock; challenge generation itself runs outside it.
+    """
+    key = (user, date.toordinal())
+    with _CHALLENGE_CACHE_LOCK:
+        challenge = _CHALLENGE_CACHE.get(key)
+        if challenge is not None:
+            _CHALLENGE_CACHE.move_to_end(key)
+            return challenge
+    challenge = planner.generate_daily_challenge(user, date)
+    with _CHALLENGE_CACHE_LOCK:
+        _CHALLENGE_CACHE[key] = challenge
+        if len(_CHALLENGE_CACHE) > _CHALLENGE_CACHE_SIZE:
+            _CHALLENGE_CACHE.popitem(last=False)
+    return challenge
+
+def require_user_profile(fn):
+    """Decorator handling the shared parse -> validate -> build-profile steps
+
+    Parses the JSON body once, validates it, builds (or fetches the cached)
+    UserProfile and calls the view as fn(user, data), so each POST route
+    only contains its own logic.
+    """
+    @wraps(fn)
+    def wrapper():
+        data = get_request_json()
+        if not isinstance(data, dict):
+            return error_response("Request body must be a JSON object")
+
+        is_valid, result = validate_user_data(data)
+        if not is_valid:
+            return error_response(result)
+
+        # Keep builder failures inside the JSON error contract rather
+        # than letting them escape as an HTML 500
+        try:
+            user = user_from_data(result)
+        except Exception as e:
+            return error_response(f"Invalid user data: {str(e)}")
+        return fn(user, data)
+    return wrapper
+
+@app.route('/api/generate-plan', methods=['POST'])
+@require_user_profile
+def generate_workout_plan(user, data):
+    """Generate a workout plan based on user profile"""
+    try:
+        # Generate plan
+        weeks = data.get('weeks', 4)  # Default to 4 weeks if not specified
+        workout_plan = planner.generate_workout_plan(user, weeks=weeks)
+
+        return json_response({
+            'workout_plan': workout_plan
+        })
+
+    except Exception as e:
+        return error_response(f"Failed to generate workout plan: {str(e)}")
+
+@app.route('/api/calculate-difficulty', methods=['POST'])
+@require_user_profile
+def calculate_difficulty(user, data):
+    """Calculate workout difficulty based on user profile"""
+    try:
+        difficulty = planner.calculate_difficulty_modifier(user)
+        return json_response({
+            'difficulty_modifier': difficulty
+        })
+
+    except Exception as e:
+        return error_response(f"Failed to calculate difficulty: {str(e)}")
+
+@app.route('/api/daily-challenge', methods=['POST'])
+@require_user_profile
+def get_daily_challenge(user, data):
+    """Generate a daily workout challenge based on user profile and optional date"""
+    try:
+        # Check if specific date is provided
+        specific_date = None
+        if 'date' in data and data['date']:
+            try:
+                specific_date = parse_date(data['date'])
+            except ValueError as e:
+                return error_response(str(e))
+
+        # Generate daily challenge
+        daily_challenge = cached_challenge(user, specific_date or datetime.now())
+
+        return json_response({
+            'daily_challenge': daily_challenge
+        })
+
+    except Exception as e:
+        return error_response(f"Failed to generate daily challenge: {str(e)}")
+
+@app.route('/api/daily-challenges-batch', methods=['POST'])
+@require_user_profile
+def get_daily_challenges_batch(user, data):
+    """Generate multiple daily challenges for a date range"""
+    try:
+        # Validate date fields
+        if 'start_date' not in data or 'end_date' not in data:
+            return error_response("Missing required fields: start_date and end_date")
+
+        # Parse dates
+        try:
+            start_date = parse_date(data['start_date'])
+            end_date = parse_date(data['end_date'])
+        except ValueError as e:
+            return error_response(str(e))
+
+        if start_date > end_date:
+            return error_response("Start date must be before or equal to end date")
+
+        # Reject oversized ranges before doing any batch work
+        days_limit = 31  # Limit to prevent excessive processing
+        span = (end_date - start_date).days + 1
+        if span > days_limit:
+            return error_response(f"Date range exceeds {days_limit} days")
+
+        # Generate a challenge for each date in the range, fanning the
+        # cold dates out across the worker pool and streaming each result
+        # as it completes; executor.map preserves date order, so the first
+        # bytes go out once day one is ready instead of after the whole
+        # batch
+        dates = [start_date + timedelta(days=i) for i in range(span)]
+        dumps = orjson.dumps if orjson is not None else (lambda o: app.json.dumps(o).encode())
+
+        def generate():
+            yield b'{"daily_challenges":['
+            first = True
+            for challenge in _EXECUTOR.map(lambda d: cached_challenge(user, d), dates):
+                if not first:
+                    yield b','
+                first = False
+                yield dumps(challenge)
+            yield b'],"count":%d}' % len(dates)
+
+        return Response(stream_with_context(generate()), mimetype='application/json')
+
+    except Exception as e:
+        return error_response(f"Failed to generate daily challenges batch: {str(e)}")
+
+if __name__ == '__main__':
+    # Serve with waitress (threaded production WSGI server) rather than the
+    # single-threaded Werkzeug debug server; gunicorn works too:
+    #   gunicorn -w 4 -k gthread --threads 2 app:app
+    try:
+        from waitress import serve
+        serve(app, host='0.0.0.0', port=8000, threads=8)
+    except ImportError:
+        app.run(host='0.0.0.0', port=8000)
\ No newline at end of file